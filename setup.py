@@ -7,7 +7,7 @@ setup(
     packages=find_packages(),
     python_requires=">=3.9",
     install_requires=[
-        "tifffile>=2023.0.0", 'tqdm'
+        "numpy", "tifffile>=2023.0.0", 'tqdm'
 	],
     entry_points={
         "console_scripts": [
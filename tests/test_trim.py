@@ -0,0 +1,182 @@
+import sys
+
+import numpy as np
+import pytest
+import tifffile
+
+from tifftrim import trim
+from tifftrim.trim import _needs_bigtiff, parse_frame_range, split_3d_tiff_into_chunks, trim_3d_tiff
+
+
+def _write_scanimage_stack(path, data, channel_offset, compression=None):
+    """Write data page by page with a ScanImage-style Software tag on every page."""
+    software = f"SI.hChannels.channelOffset = [{channel_offset} 0]"
+    with tifffile.TiffWriter(path) as tw:
+        for frame in data:
+            tw.write(frame, software=software, compression=compression, metadata=None)
+
+
+# Uncompressed stacks take the memory-mapped path, compressed ones the per-page path
+@pytest.mark.parametrize("compression", [None, "zlib"])
+@pytest.mark.parametrize("channel_offset", [-300, 1000])
+def test_add_offset_does_not_overflow(tmp_path, channel_offset, compression):
+    data = np.zeros((4, 8, 8), dtype=np.uint16)
+    data[:, 0, 0] = 65000
+    data[:, 0, 1] = 100
+    input_path = tmp_path / "in.tif"
+    output_path = tmp_path / "out.tif"
+    _write_scanimage_stack(input_path, data, channel_offset, compression)
+
+    trim_3d_tiff(input_path, output_path, 1, 3, add_offset=True, show_progress=False)
+
+    out = tifffile.imread(output_path)
+    assert out.dtype == np.int32
+    np.testing.assert_array_equal(out, data[1:3].astype(np.int32) + channel_offset)
+
+
+def test_contiguous_output_keeps_software_and_datetime_on_every_page(tmp_path):
+    data = np.arange(4 * 8 * 8, dtype=np.uint16).reshape(4, 8, 8)
+    input_path = tmp_path / "in.tif"
+    output_path = tmp_path / "out.tif"
+    with tifffile.TiffWriter(input_path) as tw:
+        for frame in data:
+            tw.write(frame, software="Acquisition 1.0", datetime="2024:01:02 03:04:05", metadata=None)
+
+    trim_3d_tiff(input_path, output_path, 1, 4, show_progress=False)
+
+    with tifffile.TiffFile(output_path) as tiff:
+        assert len(tiff.pages) == 3
+        for page in tiff.pages:
+            codes = [tag.code for tag in page.tags.values()]
+            assert codes.count(305) == 1 and codes.count(306) == 1
+            assert page.software == "Acquisition 1.0"
+            assert page.tags["DateTime"].value == "2024:01:02 03:04:05"
+        np.testing.assert_array_equal(tiff.asarray(), data[1:4])
+
+
+@pytest.mark.parametrize("force_contiguous", [False, True])
+def test_keep_per_page_description_keeps_every_description(tmp_path, force_contiguous):
+    data = np.arange(4 * 8 * 8, dtype=np.uint16).reshape(4, 8, 8)
+    input_path = tmp_path / "in.tif"
+    output_path = tmp_path / "out.tif"
+    with tifffile.TiffWriter(input_path) as tw:
+        for frame in data:
+            tw.write(frame, description="SI header frame", metadata=None)
+
+    trim_3d_tiff(
+        input_path,
+        output_path,
+        1,
+        4,
+        keep_per_page_description=True,
+        force_contiguous=force_contiguous,
+        show_progress=False,
+    )
+
+    with tifffile.TiffFile(output_path) as tiff:
+        assert len(tiff.pages) == 3
+        for page in tiff.pages:
+            assert page.tags["ImageDescription"].value == "SI header frame"
+        np.testing.assert_array_equal(np.stack([page.asarray() for page in tiff.pages]), data[1:4])
+
+
+@pytest.mark.parametrize("platform", ["linux", "win32"])
+@pytest.mark.parametrize("byteorder", ["<", ">"])
+def test_repack_copies_raw_frames(tmp_path, monkeypatch, byteorder, platform):
+    if platform == "linux" and not sys.platform.startswith("linux"):
+        pytest.skip("sendfile path is Linux only")
+    # "win32" exercises the buffered copy used off Linux
+    monkeypatch.setattr(sys, "platform", platform)
+
+    copies = []
+    copy_range = trim._copy_range
+
+    def spy_copy_range(*args):
+        copies.append(args)
+        copy_range(*args)
+
+    monkeypatch.setattr(trim, "_copy_range", spy_copy_range)
+
+    data = np.random.default_rng(0).integers(0, 60000, size=(8, 16, 24), dtype=np.uint16)
+    input_path = tmp_path / "in.tif"
+    output_path = tmp_path / "out.tif"
+    tifffile.imwrite(input_path, data, byteorder=byteorder, metadata=None, software="")
+
+    trim_3d_tiff(input_path, output_path, 2, 7, show_progress=False)
+
+    assert len(copies) == 1
+    with tifffile.TiffFile(output_path) as tiff:
+        assert tiff.byteorder == byteorder
+        assert len(tiff.pages) == 5
+        np.testing.assert_array_equal(tiff.asarray(), data[2:7])
+
+
+def test_needs_bigtiff_counts_per_page_metadata():
+    # 3.8 GB of pixels fits a classic TIFF; 1000 pages with 200 kB of tags each do not
+    page_info = {"description": "", "software": "", "extratags": []}
+    tagged_info = dict(page_info, software="x" * 100_000, extratags=[(65000, 2, 100_000, "y" * 99_999, False)])
+
+    assert not _needs_bigtiff((1900, 1000), np.uint16, [page_info] * 1000)
+    assert _needs_bigtiff((1900, 1000), np.uint16, [tagged_info] * 1000)
+
+
+def test_split_with_workers_matches_source(tmp_path):
+    data = np.random.default_rng(0).integers(0, 4000, size=(24, 16, 16), dtype=np.uint16)
+    input_path = tmp_path / "in.tif"
+    tifffile.imwrite(input_path, data, compression="zlib", metadata=None)
+
+    written = split_3d_tiff_into_chunks(input_path, tmp_path / "chunks", 3, workers=4, show_progress=False)
+
+    assert len(written) == 8
+    for idx, path in enumerate(written):
+        np.testing.assert_array_equal(tifffile.imread(path), data[idx * 3:(idx + 1) * 3])
+
+
+def test_split_with_workers_raises_chunk_errors(tmp_path, monkeypatch):
+    data = np.zeros((24, 16, 16), dtype=np.uint16)
+    input_path = tmp_path / "in.tif"
+    tifffile.imwrite(input_path, data, compression="zlib", metadata=None)
+
+    write_chunk = trim._write_chunk
+
+    def failing_write_chunk(out_path, *args, **kwargs):
+        if "_frames_06_" in out_path.name:
+            raise RuntimeError("disk full")
+        return write_chunk(out_path, *args, **kwargs)
+
+    monkeypatch.setattr(trim, "_write_chunk", failing_write_chunk)
+    with pytest.raises(RuntimeError, match="disk full"):
+        split_3d_tiff_into_chunks(input_path, tmp_path / "chunks", 3, workers=4, show_progress=False)
+
+
+@pytest.mark.parametrize("range_text, expected", [("0:100", (0, 100)), ("10:", (10, None)), (" 3 : 7 ", (3, 7))])
+def test_parse_frame_range(range_text, expected):
+    assert parse_frame_range(range_text) == expected
+
+
+@pytest.mark.parametrize("range_text", [":5", "a:b", "0:1:2", "10", "\u0661:\u0663"])
+def test_parse_frame_range_rejects_invalid(range_text):
+    with pytest.raises(ValueError):
+        parse_frame_range(range_text)
+
+
+def test_split_truncates_chunks_to_block_size(tmp_path):
+    data = np.arange(10 * 8 * 8, dtype=np.uint16).reshape(10, 8, 8)
+    input_path = tmp_path / "in.tif"
+    tifffile.imwrite(input_path, data, metadata=None)
+
+    written = split_3d_tiff_into_chunks(input_path, tmp_path / "chunks", 6, block_size=3, show_progress=False)
+
+    assert [path.name for path in written] == ["in_frames_00_06.tif", "in_frames_06_09.tif"]
+    np.testing.assert_array_equal(tifffile.imread(written[0]), data[0:6])
+    np.testing.assert_array_equal(tifffile.imread(written[1]), data[6:9])
+
+
+def test_split_with_fewer_frames_than_block_size_writes_nothing(tmp_path):
+    input_path = tmp_path / "in.tif"
+    tifffile.imwrite(input_path, np.zeros((2, 8, 8), dtype=np.uint16), metadata=None)
+
+    written = split_3d_tiff_into_chunks(input_path, tmp_path / "chunks", 3, block_size=3, show_progress=False)
+
+    assert written == []
+    assert list((tmp_path / "chunks").iterdir()) == []
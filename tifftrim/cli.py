@@ -44,6 +44,25 @@ def build_parser() -> argparse.ArgumentParser:
              "(default: 3). The last chunk may be truncated to satisfy this.",
     )
 
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="When using --chunk-size, number of chunk files to write concurrently (default: 1).",
+    )
+
+    parser.add_argument(
+        "--keep-per-page-description",
+        action="store_true",
+        help="Copy the ImageDescription of every page, not only the first one of each output file.",
+    )
+    parser.add_argument(
+        "--force-contiguous",
+        action="store_true",
+        help="Write uncompressed output as one contiguous series even if page tags differ "
+             "(only the tags of the first page of each output file are kept). "
+             "Ignored with --keep-per-page-description.",
+    )
     parser.add_argument(
         "--no-quiet",
         action="store_true",
@@ -71,6 +90,9 @@ def main(argv: list[str] | None = None) -> int:
                 args.chunk_size,
                 block_size=args.block_size,
                 add_offset=args.add_offset,
+                keep_per_page_description=args.keep_per_page_description,
+                force_contiguous=args.force_contiguous,
+                workers=args.workers,
                 quiet_tifffile_warnings=quiet,
             )
             return 0
@@ -82,6 +104,8 @@ def main(argv: list[str] | None = None) -> int:
             start,
             end,
             add_offset=args.add_offset,
+            keep_per_page_description=args.keep_per_page_description,
+            force_contiguous=args.force_contiguous,
             quiet_tifffile_warnings=quiet,
         )
         return 0
@@ -1,25 +1,33 @@
 from __future__ import annotations
 
+import itertools
+import logging
+import mmap
+import os
+import queue
 import re
+import struct
 import sys
-from io import StringIO
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
 from pathlib import Path
 from typing import Optional, Tuple, Union
 
+import numpy as np
 import tifffile
-try:
-    from tqdm.auto import tqdm
-except Exception:  # pragma: no cover
-    tqdm = None
-    print("tqdm not found, disabling progress bar")
 
 
-_AUTO_HANDLED_TAG_CODES = {
+_AUTO_HANDLED_TAG_CODES = frozenset({
     256,  # ImageWidth
     257,  # ImageLength
     258,  # BitsPerSample
     259,  # Compression
     262,  # PhotometricInterpretation
+    270,  # ImageDescription (written via description=)
+    273,  # StripOffsets
     277,  # SamplesPerPixel
     278,  # RowsPerStrip
     279,  # StripByteCounts
@@ -27,7 +35,273 @@ _AUTO_HANDLED_TAG_CODES = {
     317,  # Predictor
     320,  # ColorMap
     339,  # SampleFormat
-}
+})
+
+# Classic TIFF uses 32-bit offsets; keep headroom below 4 GiB for IFDs and tag values
+_BIGTIFF_THRESHOLD = 3_900_000_000
+
+# Generous per-page allowance for the IFD entries and strip tables tifffile writes
+_IFD_NBYTES = 1024
+
+_RANGE_RE = re.compile(r"^\s*([-+]?[0-9]+)?\s*:\s*([-+]?[0-9]+)?\s*$")
+
+
+def _progress(iterable, enabled: bool, **kwargs):
+    """Wrap iterable in a tqdm progress bar if enabled and tqdm is available.
+
+    tqdm is imported here rather than at module level so that its notebook
+    detection only runs when a progress bar is actually requested.
+    """
+    if not enabled:
+        return iterable
+    try:
+        from tqdm.auto import tqdm
+    except Exception:  # pragma: no cover
+        return iterable
+    return tqdm(iterable, **kwargs)
+
+
+def _needs_bigtiff(
+    frame_shape: Tuple[int, ...],
+    dtype,
+    page_infos: list[dict],
+    *,
+    keep_per_page_description: bool = False,
+) -> bool:
+    """Return True if one page per snapshot in page_infos, with frames of frame_shape/dtype, needs BigTIFF."""
+    frame_nbytes = int(np.prod(frame_shape)) * np.dtype(dtype).itemsize
+    nbytes = len(page_infos) * (frame_nbytes + _IFD_NBYTES)
+
+    # Every page carries its own copy of Software and the extratags, and of the
+    # description if kept on every page
+    for idx, page_info in enumerate(page_infos):
+        if idx == 0 or keep_per_page_description:
+            nbytes += len(page_info["description"] or "")
+        nbytes += len(page_info["software"] or "")
+        for _, tag_dtype, count, _, _ in page_info["extratags"]:
+            nbytes += count * struct.calcsize(tifffile.TIFF.DATA_FORMATS[tag_dtype])
+
+    return nbytes > _BIGTIFF_THRESHOLD
+
+
+@contextmanager
+def _quiet_tifffile(enabled: bool):
+    """Silence tifffile warnings (Python warnings and its logger) for the duration, if enabled."""
+    if not enabled:
+        yield
+        return
+
+    logger = logging.getLogger("tifffile")
+    level = logger.level
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        logger.setLevel(logging.ERROR)
+        try:
+            yield
+        finally:
+            logger.setLevel(level)
+
+
+def _memmap_stack(tiff: tifffile.TiffFile, n_frames: int, frame_shape: Tuple[int, ...]):
+    """
+    Memory-map the pixel data of an uncompressed, contiguous stack as [frames, y, x].
+
+    The map is built from the first series of the already open tiff, without parsing its
+    IFDs a second time. Returns None if the series is not stored as one contiguous block
+    (compressed, tiled, or written page by page), in which case frames must be decoded
+    page by page.
+    """
+    series = tiff.series[0]
+    offset = series.dataoffset
+    if offset is None:
+        return None
+
+    try:
+        data = np.memmap(
+            tiff.filehandle.path,
+            dtype=np.dtype(tiff.byteorder + series.dtype.char),
+            mode="r",
+            offset=offset,
+            shape=(n_frames, *frame_shape),
+        )
+    except ValueError:
+        # Truncated file: the series extends past its end
+        return None
+
+    # Frames are read front to back: let the kernel read ahead aggressively
+    mm = getattr(data, "_mmap", None)
+    if mm is not None and hasattr(mmap, "MADV_SEQUENTIAL"):
+        mm.madvise(mmap.MADV_SEQUENTIAL)
+    return data
+
+
+def _fadvise(fd: int, offset: int, length: int, advice: str) -> None:
+    """Give the kernel an os.POSIX_FADV_* access-pattern hint, on platforms that support it."""
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(fd, offset, length, getattr(os, advice))
+
+
+def _drop_from_cache(path: Union[str, Path]) -> None:
+    """Start writeback of a file just written and evict it from the page cache."""
+    if hasattr(os, "posix_fadvise"):
+        with open(path, "rb") as fh:
+            _fadvise(fh.fileno(), 0, 0, "POSIX_FADV_DONTNEED")
+
+
+def _iter_frames(pages: list, data, start: int):
+    """Yield the frames of pages (starting at frame index start) from the memory-map if available."""
+    if data is not None:
+        # Sequential reads from the memory-map are prefetched by kernel readahead
+        return iter(data[start:start + len(pages)])
+    return _prefetch(page.asarray() for page in pages)
+
+
+def _prefetch(iterable, maxsize: int = 4):
+    """
+    Iterate over iterable in a background thread, keeping up to maxsize items ready.
+
+    Lets reading and decoding the next frames overlap with writing the current one.
+    Exceptions raised by iterable are re-raised in the consuming thread.
+    """
+    items: queue.Queue = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+    end = object()
+
+    def put(entry) -> bool:
+        # Give up if the consumer went away, instead of blocking on a full queue forever
+        while not stop.is_set():
+            try:
+                items.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+        except BaseException as exc:
+            put((end, exc))
+        else:
+            put((end, None))
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, exc = items.get()
+            if item is end:
+                if exc is not None:
+                    raise exc
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+def _add_offset(frames, offset: int):
+    """
+    Yield each frame plus offset as int32.
+
+    All frames are written into the same preallocated buffer, so each yielded frame is only
+    valid until the next one is requested.
+    """
+    scratch = None
+    for frame in frames:
+        if scratch is None:
+            scratch = np.empty(frame.shape, dtype="int32")
+        # Add in int32 so the offset can't overflow or wrap the input dtype
+        np.add(frame, offset, out=scratch, dtype=np.int32, casting="unsafe")
+        yield scratch
+
+
+def _snapshot_pages(tiff: tifffile.TiffFile, start: int, end: int) -> Tuple[list, list[dict]]:
+    """
+    Return pages [start, end) of tiff with a snapshot per page (see _page_info).
+
+    ImageJ and single-series tifffile ("shaped") files repeat one IFD for every page after
+    the first. Those pages are loaded as lightweight TiffFrames, without parsing their tags,
+    and share a single snapshot.
+    """
+    tag_cache: dict = {}
+
+    if not (tiff.is_imagej or (tiff.is_shaped and len(tiff.series) == 1)):
+        pages = _frame_pages(tiff, start, end)
+        return pages, [_page_info(page, tag_cache) for page in pages]
+
+    tiff.pages.useframes = True
+    pages = _frame_pages(tiff, start, end)
+    page_infos = []
+    shared = None
+    for index, page in enumerate(pages, start):
+        if index == 0:
+            page_infos.append(_page_info(page.aspage(), tag_cache))
+            continue
+        if shared is None:
+            shared = _page_info(page.aspage(), tag_cache)
+        page_infos.append(shared)
+    return pages, page_infos
+
+
+def _frame_pages(tiff: tifffile.TiffFile, start: int, end: int) -> list:
+    """Return pages [start, end), checking that the file stores one page per frame."""
+    pages = tiff.pages[start:end]
+    if len(pages) != end - start:
+        raise ValueError(f"Expected one TIFF page per frame, found {len(pages)} pages for frames {start}:{end}")
+    return pages
+
+
+def _page_info(page: tifffile.TiffPage, tag_cache: Optional[dict] = None) -> dict:
+    """
+    Collect the tags and write() arguments needed to reproduce a page.
+
+    Passing the same tag_cache for every page of a file makes identical tags (e.g. the same
+    Software string on every page) share a single extratags entry instead of one per page.
+    """
+    if tag_cache is None:
+        tag_cache = {}
+
+    extratags = []
+    for tag in page.tags.values():
+        code = tag.code
+        if code in _AUTO_HANDLED_TAG_CODES:
+            continue
+
+        try:
+            value = tag.value
+        except (OSError, ValueError):
+            # Skip tags whose (delay-loaded) value can't be read
+            continue
+
+        key = (code, tag.dtype, tag.count, value)
+        try:
+            entry = tag_cache.get(key)
+        except TypeError:
+            # Unhashable value (e.g. an array): not shared
+            key = entry = None
+
+        if entry is None:
+            # Values are passed on as tifffile decoded them (tuples for sequences), which
+            # tifffile packs straight back to bytes; no per-page copy is made
+            entry = (code, tag.dtype, tag.count, value, False)
+            if key is not None:
+                tag_cache[key] = entry
+
+        extratags.append(entry)
+
+    return {
+        "extratags": extratags,
+        "description": page.description,
+        "datetime": page.datetime,
+        "resolution": page.resolution,
+        "compression": page.compression,
+        "photometric": page.photometric,
+        "planarconfig": page.planarconfig,
+        "software": page.software,
+    }
 
 
 def trim_3d_tiff(
@@ -37,6 +311,8 @@ def trim_3d_tiff(
     end_frame: Optional[int],
     *,
     add_offset: bool = False,
+    keep_per_page_description: bool = False,
+    force_contiguous: bool = False,
     quiet_tifffile_warnings: bool = True,
     show_progress: bool = True,
 ) -> None:
@@ -47,6 +323,14 @@ def trim_3d_tiff(
         - start_frame is inclusive
         - end_frame is exclusive
         - if end_frame is None, it trims until the last frame
+
+    Only the first output page keeps its ImageDescription unless keep_per_page_description
+    is set; per-page descriptions (e.g. OME-XML) can otherwise dominate the output size.
+
+    Uncompressed stacks whose pages all carry the same tags are written as one contiguous
+    series, with every page carrying the tags of the first. force_contiguous does so even
+    if tags differ, keeping only those of the first page. Neither applies when
+    keep_per_page_description is set, since a series has a single description.
     """
     input_path = Path(input_path)
     output_path = Path(output_path)
@@ -56,20 +340,14 @@ def trim_3d_tiff(
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    orig_err = sys.stderr
-    if quiet_tifffile_warnings:
-        sys.stderr = StringIO()
-
-    try:
-        imagej_metadata = None
-
+    with _quiet_tifffile(quiet_tifffile_warnings):
         with tifffile.TiffFile(str(input_path)) as tiff:
-            data = tiff.asarray()
-
-            if len(data.shape) != 3:
-                raise ValueError(f"Expected a 3D TIFF [frames, y, x], got shape {data.shape}")
+            # Validate from the series header only; no pixel data is read until writing
+            shape = tiff.series[0].shape
+            if len(shape) != 3:
+                raise ValueError(f"Expected a 3D TIFF [frames, y, x], got shape {shape}")
 
-            n_frames = data.shape[0]
+            n_frames, frame_shape = shape[0], shape[1:]
 
             if end_frame is None:
                 end_frame = n_frames
@@ -83,78 +361,62 @@ def trim_3d_tiff(
             if start_frame >= end_frame:
                 raise ValueError("start_frame must be < end_frame")
 
-            original_pages = []
-            for page in tiff.pages[start_frame:end_frame]:
-                extratags = []
-                for tag in page.tags.values():
-                    if int(tag.code) in _AUTO_HANDLED_TAG_CODES:
-                        continue
-
-                    try:
-                        if isinstance(tag.value, (tuple, list)):
-                            value = list(tag.value)
-                        else:
-                            value = tag.value
-
-                        extratags.append(
-                            (
-                                int(tag.code),
-                                tag.dtype,
-                                tag.count,
-                                value,
-                                False,
-                            )
-                        )
-                    except Exception:
-                        # Skip tags that can't be serialized by tifffile extratags
-                        continue
-
-                original_pages.append(
-                    {
-                        "extratags": extratags,
-                        "description": page.description,
-                        "datetime": page.datetime,
-                        "resolution": page.resolution,
-                        "compression": page.compression,
-                        "photometric": page.photometric,
-                        "planarconfig": page.planarconfig,
-                        "software": page.software,
-                    }
+            offset = get_offset(tiff.pages[0].software) if add_offset else None
+            out_dtype = np.dtype("int32") if offset is not None else tiff.pages[0].dtype
+            data = _memmap_stack(tiff, n_frames, frame_shape)
+
+            pages, page_infos = _snapshot_pages(tiff, start_frame, end_frame)
+
+            # Pixel data is read front to back; frames outside the range are never needed
+            fd = tiff.filehandle.fileno()
+            _fadvise(fd, 0, 0, "POSIX_FADV_SEQUENTIAL")
+            if data is not None:
+                frame_nbytes = data[0].nbytes
+                _fadvise(fd, 0, data.offset + start_frame * frame_nbytes, "POSIX_FADV_DONTNEED")
+                _fadvise(fd, data.offset + end_frame * frame_nbytes, 0, "POSIX_FADV_DONTNEED")
+
+            bigtiff = _needs_bigtiff(
+                frame_shape,
+                out_dtype,
+                page_infos,
+                keep_per_page_description=keep_per_page_description,
+            )
+
+            if data is not None and offset is None and _writes_contiguous(
+                page_infos,
+                keep_per_page_description=keep_per_page_description,
+                force_contiguous=force_contiguous,
+            ):
+                _repack_chunk(
+                    output_path,
+                    data,
+                    start_frame,
+                    end_frame,
+                    page_infos[0],
+                    bigtiff=bigtiff,
+                    byteorder=tiff.byteorder,
                 )
-
-            trimmed_data = data[start_frame:end_frame]
-
-            if add_offset:
-                offset = get_offset(tiff.pages[0].software)
-                trimmed_data = trimmed_data.astype("int32") + offset
-
-            with tifffile.TiffWriter(str(output_path), bigtiff=tiff.is_bigtiff) as tw:
-                iterable = zip(trimmed_data, original_pages)
-                if tqdm is not None:
-                    iterable = tqdm(
-                        iterable,
-                        total=len(original_pages),
-                        desc="Writing frames",
-                        unit="frame",
-                        disable=not show_progress,
-                    )
-
-                for idx, (frame, page_info) in enumerate(iterable):
-                    tw.write(
-                        frame,
-                        description=page_info["description"],
-                        datetime=page_info["datetime"],
-                        resolution=page_info["resolution"],
-                        compression=page_info["compression"],
-                        photometric=page_info["photometric"],
-                        planarconfig=page_info["planarconfig"],
-                        extratags=page_info["extratags"],
-                        metadata=imagej_metadata if idx == 0 else None,
-                        software=page_info["software"],
-                    )
-    finally:
-        if quiet_tifffile_warnings:
-            sys.stderr = orig_err
+                return
+
+            # Only the pages in range are read, one at a time, so memory stays
+            # at a single frame regardless of stack size.
+            frames = _progress(
+                _iter_frames(pages, data, start_frame),
+                show_progress,
+                total=len(pages),
+                desc="Writing frames",
+                unit="frame",
+            )
+
+            _write_chunk(
+                output_path,
+                frames,
+                page_infos,
+                offset=offset,
+                bigtiff=bigtiff,
+                keep_per_page_description=keep_per_page_description,
+                force_contiguous=force_contiguous,
+            )
 
 
 def split_3d_tiff_into_chunks(
@@ -164,6 +426,9 @@ def split_3d_tiff_into_chunks(
     *,
     block_size: int = 3,
     add_offset: bool = False,
+    keep_per_page_description: bool = False,
+    force_contiguous: bool = False,
+    workers: int = 1,
     quiet_tifffile_warnings: bool = True,
     show_progress: bool = True,
 ) -> list[Path]:
@@ -176,6 +441,12 @@ def split_3d_tiff_into_chunks(
 
     When block_size is provided, each output file will have a number of frames that
     is a multiple of block_size. The last chunk may be truncated to satisfy this.
+
+    Only the first page of each output file keeps its ImageDescription unless
+    keep_per_page_description is set. Chunks are written as contiguous series as described
+    in trim_3d_tiff, including the force_contiguous override.
+
+    Up to workers chunks are written concurrently, each to its own file.
     """
     if chunk_size <= 0:
         raise ValueError("chunk_size must be a positive integer")
@@ -183,6 +454,8 @@ def split_3d_tiff_into_chunks(
         raise ValueError("block_size must be a positive integer")
     if chunk_size % block_size != 0:
         raise ValueError(f"chunk_size ({chunk_size}) must be a multiple of block_size ({block_size})")
+    if workers <= 0:
+        raise ValueError("workers must be a positive integer")
 
     input_path = Path(input_path)
     output_dir = Path(output_dir)
@@ -192,117 +465,323 @@ def split_3d_tiff_into_chunks(
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    orig_err = sys.stderr
-    if quiet_tifffile_warnings:
-        sys.stderr = StringIO()
-
     written: list[Path] = []
-    try:
-        imagej_metadata = None
-
+    with _quiet_tifffile(quiet_tifffile_warnings):
         with tifffile.TiffFile(str(input_path)) as tiff:
-            data = tiff.asarray()
-
-            if len(data.shape) != 3:
-                raise ValueError(f"Expected a 3D TIFF [frames, y, x], got shape {data.shape}")
+            # Validate from the series header only; no pixel data is read until writing
+            shape = tiff.series[0].shape
+            if len(shape) != 3:
+                raise ValueError(f"Expected a 3D TIFF [frames, y, x], got shape {shape}")
 
-            n_frames = data.shape[0]
+            n_frames, frame_shape = shape[0], shape[1:]
             if n_frames == 0:
                 return []
 
-            pad_width = max(1, len(str(n_frames)))
+            offset = get_offset(tiff.pages[0].software) if add_offset else None
+            out_dtype = np.dtype("int32") if offset is not None else tiff.pages[0].dtype
+            data = _memmap_stack(tiff, n_frames, frame_shape)
 
-            ranges = [(start, min(start + chunk_size, n_frames)) for start in range(0, n_frames, chunk_size)]
+            pad_width = max(1, len(str(n_frames)))
 
-            range_iter = ranges
-            if tqdm is not None:
-                range_iter = tqdm(
-                    ranges,
-                    total=len(ranges),
+            # chunk_size is a multiple of block_size, so capping every chunk at the last whole
+            # block keeps all chunks block-aligned and drops any final remainder up front.
+            usable = (n_frames // block_size) * block_size
+            ranges = [(start, min(start + chunk_size, usable)) for start in range(0, usable, chunk_size)]
+
+            stem = input_path.stem
+            out_paths = [
+                output_dir / f"{stem}_frames_{start:0{pad_width}d}_{end:0{pad_width}d}.tif"
+                for start, end in ranges
+            ]
+
+            # Pages (IFDs) and their tags are gathered here in one sweep, in a single thread;
+            # workers only decode pixel data, which tifffile serialises through the file
+            # handle lock.
+            if workers > 1:
+                tiff.filehandle.lock = True
+
+            pages, snapshots = _snapshot_pages(tiff, 0, n_frames)
+            _fadvise(tiff.filehandle.fileno(), 0, 0, "POSIX_FADV_SEQUENTIAL")
+
+            jobs = []
+            for (start, end), out_path in zip(ranges, out_paths):
+                page_infos = snapshots[start:end]
+                bigtiff = _needs_bigtiff(
+                    frame_shape,
+                    out_dtype,
+                    page_infos,
+                    keep_per_page_description=keep_per_page_description,
+                )
+                if data is not None and offset is None and _writes_contiguous(
+                    page_infos,
+                    keep_per_page_description=keep_per_page_description,
+                    force_contiguous=force_contiguous,
+                ):
+                    jobs.append(partial(
+                        _repack_chunk,
+                        out_path,
+                        data,
+                        start,
+                        end,
+                        page_infos[0],
+                        bigtiff=bigtiff,
+                        byteorder=tiff.byteorder,
+                    ))
+                else:
+                    jobs.append(partial(
+                        _write_chunk,
+                        out_path,
+                        _iter_frames(pages[start:end], data, start),
+                        page_infos,
+                        offset=offset,
+                        bigtiff=bigtiff,
+                        keep_per_page_description=keep_per_page_description,
+                        force_contiguous=force_contiguous,
+                    ))
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(job) for job in jobs]
+                written.extend(_progress(
+                    (future.result() for future in futures),
+                    show_progress,
+                    total=len(jobs),
                     desc="Writing chunks",
                     unit="chunk",
-                    disable=not show_progress,
-                )
-
-            for start, end in range_iter:
-                n = end - start
-                n_trunc = (n // block_size) * block_size
-                end = start + n_trunc
-
-                if end <= start:
-                    # If the final remainder is smaller than block_size, truncate it away.
-                    # (Only possible for the last chunk, given the chunk_size multiple check.)
-                    continue
-
-                start_s = f"{start:0{pad_width}d}"
-                end_s = f"{end:0{pad_width}d}"
-                out_path = output_dir / f"{input_path.stem}_frames_{start_s}_{end_s}.tif"
-
-                original_pages = []
-                for page in tiff.pages[start:end]:
-                    extratags = []
-                    for tag in page.tags.values():
-                        if int(tag.code) in _AUTO_HANDLED_TAG_CODES:
-                            continue
-
-                        try:
-                            if isinstance(tag.value, (tuple, list)):
-                                value = list(tag.value)
-                            else:
-                                value = tag.value
-
-                            extratags.append(
-                                (
-                                    int(tag.code),
-                                    tag.dtype,
-                                    tag.count,
-                                    value,
-                                    False,
-                                )
-                            )
-                        except Exception:
-                            continue
-
-                    original_pages.append(
-                        {
-                            "extratags": extratags,
-                            "description": page.description,
-                            "datetime": page.datetime,
-                            "resolution": page.resolution,
-                            "compression": page.compression,
-                            "photometric": page.photometric,
-                            "planarconfig": page.planarconfig,
-                            "software": page.software,
-                        }
-                    )
-
-                chunk_data = data[start:end]
-
-                if add_offset:
-                    offset = get_offset(tiff.pages[0].software)
-                    chunk_data = chunk_data.astype("int32") + offset
-
-                with tifffile.TiffWriter(str(out_path), bigtiff=tiff.is_bigtiff) as tw:
-                    for idx, (frame, page_info) in enumerate(zip(chunk_data, original_pages)):
-                        tw.write(
-                            frame,
-                            description=page_info["description"],
-                            datetime=page_info["datetime"],
-                            resolution=page_info["resolution"],
-                            compression=page_info["compression"],
-                            photometric=page_info["photometric"],
-                            planarconfig=page_info["planarconfig"],
-                            extratags=page_info["extratags"],
-                            metadata=imagej_metadata if idx == 0 else None,
-                            software=page_info["software"],
-                        )
-
-                written.append(out_path)
+                ))
 
         return written
+
+
+def _varying_keys(page_infos: list[dict]) -> list[str]:
+    """Return the snapshot keys whose value is not the same on every page."""
+    first = page_infos[0]
+    varying = []
+    for key, value in first.items():
+        try:
+            if any(info[key] is not value and info[key] != value for info in page_infos[1:]):
+                varying.append(key)
+        except ValueError:
+            # Array-valued tags can't be compared as a whole; treat them as differing
+            varying.append(key)
+    return varying
+
+
+def _is_uniform(page_infos: list[dict]) -> bool:
+    """Return True if every snapshot matches the first, apart from its description."""
+    return all(key == "description" for key in _varying_keys(page_infos))
+
+
+def _writes_contiguous(
+    page_infos: list[dict],
+    *,
+    keep_per_page_description: bool = False,
+    force_contiguous: bool = False,
+) -> bool:
+    """Return True if the pages can be written as a single contiguous series."""
+    # tifffile writes the description to the first page of a series only, and can only
+    # append uncompressed frames to a contiguous series
+    if keep_per_page_description or page_infos[0]["compression"] != tifffile.COMPRESSION.NONE:
+        return False
+    return force_contiguous or _is_uniform(page_infos)
+
+
+def _write_frames(
+    tw: tifffile.TiffWriter,
+    frames,
+    page_infos: list[dict],
+    *,
+    keep_per_page_description: bool = False,
+) -> None:
+    """
+    Write each frame with its page snapshot.
+
+    Snapshots are keyed by TiffWriter.write() argument names. Arguments that are the same on
+    every page are bound to write() once; only the varying ones are passed per frame.
+    """
+    varying = _varying_keys(page_infos)
+    if "description" not in varying:
+        varying.append("description")
+    first = page_infos[0]
+    write = partial(tw.write, metadata=None, **{key: first[key] for key in first if key not in varying})
+
+    for idx, (frame, page_info) in enumerate(zip(frames, page_infos)):
+        kwargs = {key: page_info[key] for key in varying}
+        if idx and not keep_per_page_description:
+            kwargs["description"] = None
+        write(frame, **kwargs)
+
+
+def _series_kwargs(page_info: dict) -> dict:
+    """Return the write() arguments for a contiguous series whose pages all match page_info."""
+    return dict(
+        page_info,
+        # tifffile writes Software and DateTime to the first page of a series only. The
+        # page's own tags are already in extratags, which go on every page, so tifffile's
+        # copies are disabled rather than written twice
+        software="",
+        datetime=None,
+        # Pages are single-sample; a planar configuration would make tifffile read the
+        # stack shape as [y, x, samples]
+        planarconfig=None,
+    )
+
+
+def _write_mapped(
+    out_path: Path,
+    frames,
+    page_infos: list[dict],
+    *,
+    offset: Optional[int],
+    bigtiff: bool,
+) -> None:
+    """
+    Write frames as a single contiguous series by copying them into a memory-mapped output.
+
+    tifffile creates the file with the first snapshot's tags on every page and maps the data
+    region; each frame (plus offset, if given) is then copied straight into place.
+    """
+    frames = iter(frames)
+    first = next(frames)
+    dtype = np.dtype("int32") if offset is not None else first.dtype.newbyteorder("=")
+
+    out = tifffile.memmap(
+        str(out_path),
+        shape=(len(page_infos), *first.shape),
+        dtype=dtype,
+        bigtiff=bigtiff,
+        metadata=None,
+        **_series_kwargs(page_infos[0]),
+    )
+    try:
+        for idx, frame in enumerate(itertools.chain((first,), frames)):
+            if offset is not None:
+                # Add in int32 so the offset can't overflow or wrap the input dtype
+                np.add(frame, offset, out=out[idx], dtype=np.int32, casting="unsafe")
+            else:
+                out[idx] = frame
+        out.flush()
     finally:
-        if quiet_tifffile_warnings:
-            sys.stderr = orig_err
+        del out
+
+
+def _write_chunk(
+    out_path: Path,
+    frames,
+    page_infos: list[dict],
+    *,
+    offset: Optional[int],
+    bigtiff: bool,
+    keep_per_page_description: bool = False,
+    force_contiguous: bool = False,
+) -> Path:
+    """Write frames with their page snapshots to out_path and return the path."""
+    if _writes_contiguous(
+        page_infos,
+        keep_per_page_description=keep_per_page_description,
+        force_contiguous=force_contiguous,
+    ):
+        _write_mapped(out_path, frames, page_infos, offset=offset, bigtiff=bigtiff)
+        _drop_from_cache(out_path)
+        return out_path
+
+    if offset is not None:
+        frames = _add_offset(frames, offset)
+
+    with _open_output(out_path) as fh:
+        with tifffile.TiffWriter(fh, bigtiff=bigtiff) as tw:
+            _write_frames(tw, frames, page_infos, keep_per_page_description=keep_per_page_description)
+        fh.flush()
+        _fadvise(fh.fileno(), 0, 0, "POSIX_FADV_DONTNEED")
+
+    return out_path
+
+
+def _open_output(path: Path):
+    """Create or truncate path for sequential binary writing and return the open file."""
+
+    def opener(name, flags: int) -> int:
+        fd = os.open(name, flags | getattr(os, "O_BINARY", 0) | getattr(os, "O_SEQUENTIAL", 0), 0o666)
+        _fadvise(fd, 0, 0, "POSIX_FADV_SEQUENTIAL")
+        return fd
+
+    return open(path, "wb", opener=opener)
+
+
+def _repack_chunk(
+    out_path: Path,
+    data: np.memmap,
+    start: int,
+    end: int,
+    page_info: dict,
+    *,
+    bigtiff: bool,
+    byteorder: str,
+) -> Path:
+    """
+    Write frames [start, end) of a memory-mapped stack by copying their raw bytes.
+
+    tifffile writes the header and IFDs of an empty contiguous series described by
+    page_info, then the pixel bytes are copied from the input file into the reserved region
+    without passing through Python. Returns out_path.
+    """
+    frame_nbytes = data[0].nbytes
+    out_offset, _ = tifffile.imwrite(
+        str(out_path),
+        None,
+        shape=(end - start, *data.shape[1:]),
+        dtype=data.dtype,
+        byteorder=byteorder,
+        bigtiff=bigtiff,
+        metadata=None,
+        returnoffset=True,
+        **_series_kwargs(page_info),
+    )
+    _copy_file_range(
+        data.filename,
+        data.offset + start * frame_nbytes,
+        out_path,
+        out_offset,
+        (end - start) * frame_nbytes,
+    )
+    return out_path
+
+
+def _copy_file_range(
+    src_path: Union[str, Path],
+    src_offset: int,
+    dst_path: Union[str, Path],
+    dst_offset: int,
+    nbytes: int,
+) -> None:
+    """Copy nbytes from src_path at src_offset over dst_path at dst_offset."""
+    with open(src_path, "rb") as src, open(dst_path, "r+b") as dst:
+        _fadvise(src.fileno(), src_offset, nbytes, "POSIX_FADV_SEQUENTIAL")
+        _copy_range(src, src_offset, dst, dst_offset, nbytes)
+        _fadvise(dst.fileno(), dst_offset, nbytes, "POSIX_FADV_DONTNEED")
+
+
+def _copy_range(src, src_offset: int, dst, dst_offset: int, nbytes: int) -> None:
+    """Copy nbytes between two open binary files, kernel-side on Linux."""
+    if sys.platform.startswith("linux"):
+        # sendfile writes at the current position of dst
+        os.lseek(dst.fileno(), dst_offset, os.SEEK_SET)
+        while nbytes > 0:
+            sent = os.sendfile(dst.fileno(), src.fileno(), src_offset, nbytes)
+            if sent == 0:
+                raise OSError(f"Unexpected end of file: {src.name}")
+            src_offset += sent
+            nbytes -= sent
+        return
+
+    src.seek(src_offset)
+    dst.seek(dst_offset)
+    while nbytes > 0:
+        buf = src.read(min(nbytes, 1 << 24))
+        if not buf:
+            raise OSError(f"Unexpected end of file: {src.name}")
+        dst.write(buf)
+        nbytes -= len(buf)
+    dst.flush()
 
 
 def parse_frame_range(range_text: str) -> Tuple[int, Optional[int]]:
@@ -314,20 +793,15 @@ def parse_frame_range(range_text: str) -> Tuple[int, Optional[int]]:
         "0:100" -> (0, 100)
         "10:"   -> (10, None)
     """
-    text = range_text.strip()
-    if ":" not in text:
+    match = _RANGE_RE.match(range_text)
+    if match is None:
         raise ValueError('Range must be in the form "start:end" (end exclusive), e.g. "0:100" or "10:"')
 
-    start_str, end_str = text.split(":", 1)
-    start_str = start_str.strip()
-    end_str = end_str.strip()
-
-    if start_str == "":
+    start_str, end_str = match.groups()
+    if start_str is None:
         raise ValueError('Range "start:end" requires a start value (e.g. "0:100")')
 
-    start = int(start_str)
-    end = None if end_str == "" else int(end_str)
-    return start, end
+    return int(start_str), None if end_str is None else int(end_str)
 
 
 def get_offset(page_content: str) -> int: